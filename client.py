@@ -1,15 +1,66 @@
 import boto3
 import argparse
+import asyncio
+import os
 import sys
+from functools import lru_cache
 import pandas as pd
-import tempfile
-import os
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from botocore.config import Config
+from pyarrow.fs import S3FileSystem
 from tabulate import tabulate
 
+try:
+    import aioboto3
+    from aiobotocore.config import AioConfig
+except ImportError:
+    aioboto3 = None
+
+try:
+    import fastparquet
+except ImportError:
+    fastparquet = None
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+# Number of concurrent S3 reads; throughput saturates at around 16 parallel GETs
+S3_READ_CONCURRENCY = 16
+
+# Retry settings shared by the boto3 and aioboto3 clients
+BOTO_RETRIES = {'max_attempts': 10, 'mode': 'adaptive'}
+
+# Shared by all boto3 clients. They only make sequential calls (EMR requests and
+# the S3 listing); concurrent S3 reads go through pyarrow or aioboto3, so the
+# default connection pool is enough
+BOTO_CONFIG = Config(retries=BOTO_RETRIES)
+
+# Columns written by the Spark job in main.py
+RESULT_COLUMNS = ['name', 'total_red_violations']
+
+# Parquet readers supported by read_parquet_results
+READ_ENGINES = ('pyarrow', 'fastparquet', 'polars')
+
+# Larger result tables are printed with DataFrame.to_string instead of tabulate,
+# which formats every cell in pure Python
+TABULATE_MAX_ROWS = 50
+
+_session = boto3.session.Session()
+
+@lru_cache(maxsize=None)
+def _client(service, region):
+    """Build a boto3 client once per service and region and reuse it"""
+    return _session.client(service, region_name=region, config=BOTO_CONFIG)
+
 class EMRClient:
     def __init__(self, region='us-east-2'):
-        self.emr_client = boto3.client('emr', region_name=region)
-        self.s3_client = boto3.client('s3', region_name=region)
+        self.region = region
+        self.emr_client = _client('emr', region)
+        self.s3_client = _client('s3', region)
 
     def add_spark_step(self, cluster_id, script_path, data_source, output_uri):
         """
@@ -65,12 +116,38 @@ class EMRClient:
         )
         return response['Step']
     
-    def wait_for_step_completion(self, cluster_id, step_id, poll_interval=30):
-        """Wait for a step to complete and print status updates"""
+    def _poll_delays(self, initial_interval, max_interval):
+        """Yield sleep times growing 1.5x per poll up to max_interval, with jitter"""
+        import random
+
+        delay = initial_interval
+        while True:
+            yield delay * random.uniform(0.8, 1.2)
+            delay = min(max_interval, delay * 1.5)
+
+    def wait_for_step_completion(self, cluster_id, step_id, initial_interval=2, max_interval=60,
+                                 poll_interval=None):
+        """
+        Wait for a step to complete and print status updates
+
+        Polls with exponential backoff, so short steps are picked up quickly
+        while long-running ones don't spend a describe_step call every tick.
+        poll_interval is deprecated; passing it keeps the old fixed-interval
+        polling by using it as both initial_interval and max_interval.
+        """
         import time
+
+        if poll_interval is not None:
+            import warnings
+            warnings.warn(
+                "poll_interval is deprecated; use initial_interval and max_interval",
+                DeprecationWarning,
+                stacklevel=2
+            )
+            initial_interval = max_interval = poll_interval
         
         print(f"Waiting for step {step_id} to complete...")
-        while True:
+        for delay in self._poll_delays(initial_interval, max_interval):
             step_info = self.describe_step(cluster_id, step_id)
             status = step_info['Status']['State']
             
@@ -80,9 +157,221 @@ class EMRClient:
                 print(f"Step finished with status: {status}")
                 return status == 'COMPLETED'
             
-            time.sleep(poll_interval)
+            time.sleep(delay)
+
+    def wait_for_steps_completion(self, cluster_id, step_ids, initial_interval=2, max_interval=60):
+        """
+        Wait for several steps at once, polling them with a single list_steps call
+
+        Returns True only if every step completed successfully. Raises ValueError
+        if a step ID is not found on the cluster.
+        """
+        import time
+
+        print(f"Waiting for steps {', '.join(step_ids)} to complete...")
+        pending = set(step_ids)
+        all_completed = True
+        for delay in self._poll_delays(initial_interval, max_interval):
+            # list_steps accepts at most 10 step IDs per call
+            pending_ids = sorted(pending)
+            for i in range(0, len(pending_ids), 10):
+                response = self.emr_client.list_steps(
+                    ClusterId=cluster_id,
+                    StepIds=pending_ids[i:i + 10]
+                )
+
+                # Without this a mistyped ID, or one from another cluster,
+                # would keep the loop polling forever
+                missing = set(pending_ids[i:i + 10]) - {step['Id'] for step in response['Steps']}
+                if missing:
+                    raise ValueError(f"Steps not found on cluster {cluster_id}: {', '.join(sorted(missing))}")
+
+                for step in response['Steps']:
+                    status = step['Status']['State']
+                    print(f"Step {step['Id']} status: {status}")
+                    if status in ['COMPLETED', 'FAILED', 'CANCELLED']:
+                        pending.discard(step['Id'])
+                        all_completed = all_completed and status == 'COMPLETED'
+
+            if not pending:
+                print("All steps finished")
+                return all_completed
+
+            time.sleep(delay)
+
+    def _parse_s3_uri(self, output_uri):
+        """Split an s3://bucket/path/ URI into its bucket and key prefix"""
+        if not output_uri.startswith('s3://'):
+            raise ValueError("Output URI must start with 's3://'")
+
+        s3_parts = output_uri.replace('s3://', '').split('/', 1)
+        if len(s3_parts) < 2:
+            raise ValueError("Invalid S3 URI format. Should be 's3://bucket/path/'")
+
+        bucket = s3_parts[0]
+        prefix = s3_parts[1]
+        if not prefix.endswith('/'):
+            prefix += '/'
+        return bucket, prefix
+
+    def _list_output_kwargs(self, bucket, prefix):
+        """
+        list_objects_v2 arguments for listing the part files under an output prefix
+
+        Starting after the _SUCCESS marker skips it (it sorts before part-*), and
+        the delimiter keeps Spark's nested _temporary/ directories out of the
+        listing so stale shards are never picked up.
+        """
+        return {
+            'Bucket': bucket,
+            'Prefix': prefix,
+            'StartAfter': prefix + '_SUCCESS',
+            'Delimiter': '/',
+        }
+
+    def _find_parquet_files(self, output_uri, keys):
+        """
+        Pick the parquet data files out of the keys listed under the output URI
+
+        Returns an empty list (after printing why) when there is nothing to read.
+        """
+        if not keys:
+            print(f"No data files found in {output_uri}")
+            print("The job may not have written any output, or the query returned no results.")
+            return []
+
+        # Find parquet files (part-* files written by Spark)
+        parquet_files = [key for key in keys if key.endswith('.parquet') or '/part-' in key]
+
+        if not parquet_files:
+            print(f"No parquet files found in {output_uri}")
+        return parquet_files
+
+    def _display_results(self, df, total_rows, num_files):
+        """Print the results table and a short summary"""
+        print("\nRESTAURANT VIOLATIONS ANALYSIS RESULTS:")
+        print("="*50)
+        if len(df) <= TABULATE_MAX_ROWS:
+            print(tabulate(df, headers='keys', tablefmt='psql', showindex=False))
+        else:
+            print(df.to_string(index=False, max_colwidth=40))
+        print("="*50)
+        print(f"Showing {len(df)} of {total_rows} rows")
+        print(f"Total files in output: {num_files}")
+
+    def _read_with_pyarrow(self, paths, limit, columns):
+        """Read the part files with pyarrow; returns (DataFrame, total row count)"""
+        # Open all parts straight from S3 as one Arrow dataset; pyarrow
+        # fetches and decodes the column chunks in parallel
+        s3_fs = S3FileSystem(region=self.region)
+
+        if len(paths) == 1:
+            # Coalesced Spark output is a single part file; read it directly and
+            # skip dataset discovery
+            table, total_rows = self._read_single_file(s3_fs, paths[0], limit, columns)
+        else:
+            # pre_buffer coalesces the range reads for each row group into fewer,
+            # larger S3 requests
+            parquet_format = ds.ParquetFileFormat(
+                read_options=ds.ParquetReadOptions(coerce_int96_timestamp_unit='ms'),
+                default_fragment_scan_options=ds.ParquetFragmentScanOptions(pre_buffer=True)
+            )
+            dataset = ds.dataset(paths, format=parquet_format, filesystem=s3_fs)
+
+            # The total comes from the parquet footers, so no data pages are read
+            total_rows = dataset.count_rows()
+
+            # Only scan as many row groups as needed to fill the limit
+            if limit > 0:
+                table = dataset.head(limit, columns=columns, use_threads=True)
+            else:
+                table = dataset.to_table(columns=columns, use_threads=True)
+
+        df = table.to_pandas(split_blocks=True, self_destruct=True)
+        return df, total_rows
+
+    def _read_single_file(self, s3_fs, path, limit, columns):
+        """Read one parquet file into an Arrow table; returns (table, total row count)"""
+        with s3_fs.open_input_file(path) as source:
+            parquet_file = pq.ParquetFile(
+                source,
+                pre_buffer=True,
+                coerce_int96_timestamp_unit='ms'
+            )
+            total_rows = parquet_file.metadata.num_rows
+
+            if limit <= 0 or limit >= total_rows:
+                return parquet_file.read(columns=columns, use_threads=True), total_rows
 
-    def read_parquet_results(self, output_uri, limit=10):
+            # Stop reading batches once the limit is filled
+            batches = []
+            collected = 0
+            for batch in parquet_file.iter_batches(batch_size=limit, columns=columns, use_threads=True):
+                batches.append(batch)
+                collected += batch.num_rows
+                if collected >= limit:
+                    break
+            return pa.Table.from_batches(batches).slice(0, limit), total_rows
+
+    def _read_with_fastparquet(self, paths, limit, columns):
+        """Read the part files with fastparquet; returns (DataFrame, total row count)"""
+        if fastparquet is None:
+            raise ImportError("The fastparquet engine requires fastparquet (pip install fastparquet)")
+
+        s3_fs = S3FileSystem(region=self.region)
+
+        def open_with(path, mode='rb'):
+            return s3_fs.open_input_file(path)
+
+        parts = []
+        total_rows = 0
+        collected = 0
+        for path in paths:
+            pf = fastparquet.ParquetFile(path, open_with=open_with)
+            total_rows += pf.count()
+
+            # Once the limit is filled only the footers are needed, for the total
+            if limit > 0 and collected >= limit:
+                continue
+
+            # Stream one row group at a time and stop as soon as the limit is filled
+            for df_part in pf.iter_row_groups(columns=columns):
+                parts.append(df_part)
+                collected += len(df_part)
+                if limit > 0 and collected >= limit:
+                    break
+
+        if not parts:
+            return pd.DataFrame(columns=columns), total_rows
+
+        df = pd.concat(parts, ignore_index=True)
+        if limit > 0:
+            df = df.head(limit)
+        return df, total_rows
+
+    def _read_with_polars(self, paths, limit, columns):
+        """Read the part files with a lazy Polars scan; returns (DataFrame, total row count)"""
+        if pl is None:
+            raise ImportError("The polars engine requires polars (pip install polars)")
+
+        lazy_df = pl.scan_parquet(
+            [f"s3://{path}" for path in paths],
+            storage_options={'aws_region': self.region}
+        )
+
+        # Answered from the parquet footers without reading data pages
+        total_rows = lazy_df.select(pl.len()).collect().item()
+
+        # Projection and limit are pushed into the reader, which scans row
+        # groups in parallel
+        if columns is not None:
+            lazy_df = lazy_df.select(columns)
+        if limit > 0:
+            lazy_df = lazy_df.limit(limit)
+        df = lazy_df.collect().to_pandas()
+        return df, total_rows
+
+    def read_parquet_results(self, output_uri, limit=10, columns=None, engine='pyarrow'):
         """
         Read and display results from parquet files in S3
         
@@ -92,81 +381,110 @@ class EMRClient:
             S3 URI where the parquet files are stored (e.g., s3://bucket/path/)
         limit : int
             Maximum number of rows to display
+        columns : list of str, optional
+            Columns to read; only these column chunks are fetched from S3.
+            Reads all columns when None.
+        engine : str
+            Parquet reader to use, one of READ_ENGINES
         """
         try:
-            # Parse the S3 URI
-            if not output_uri.startswith('s3://'):
-                raise ValueError("Output URI must start with 's3://'")
-            
-            s3_parts = output_uri.replace('s3://', '').split('/', 1)
-            if len(s3_parts) < 2:
-                raise ValueError("Invalid S3 URI format. Should be 's3://bucket/path/'")
-            
-            bucket = s3_parts[0]
-            prefix = s3_parts[1]
-            if not prefix.endswith('/'):
-                prefix += '/'
+            if engine not in READ_ENGINES:
+                raise ValueError(f"Unknown engine '{engine}'. Should be one of: {', '.join(READ_ENGINES)}")
+
+            bucket, prefix = self._parse_s3_uri(output_uri)
             
-            # List objects in the S3 location
+            # List objects in the S3 location; paginate since a single
+            # list_objects_v2 call stops at 1000 keys
             print(f"Listing objects in {output_uri}...")
-            response = self.s3_client.list_objects_v2(Bucket=bucket, Prefix=prefix)
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            keys = [
+                obj['Key']
+                for page in paginator.paginate(**self._list_output_kwargs(bucket, prefix))
+                for obj in page.get('Contents', [])
+            ]
 
-            if 'Contents' not in response:
-                print(f"No objects found in {output_uri}")
-                return
-            
-            # Find parquet files (look for part-* files or _SUCCESS file to confirm completion)
-            parquet_files = []
-            has_success = False
-            
-            for obj in response['Contents']:
-                key = obj['Key']
-                if key.endswith('_SUCCESS'):
-                    has_success = True
-                elif key.endswith('.parquet') or '/part-' in key:
-                    parquet_files.append(key)
-            
+            parquet_files = self._find_parquet_files(output_uri, keys)
             if not parquet_files:
-                print(f"No parquet files found in {output_uri}")
-                if has_success:
-                    print("Found _SUCCESS marker but no data files. The query may have returned no results.")
                 return
-            
 
-            # Create a temporary directory to store the parquet files
-            with tempfile.TemporaryDirectory() as temp_dir:
-                all_data = []
-                
-                # Download and read each parquet file
-                for i, key in enumerate(parquet_files):
-                    local_path = os.path.join(temp_dir, f"part-{i}.parquet")
-                    print(f"Downloading {key} to temporary location...")
-                    self.s3_client.download_file(bucket, key, local_path)
-                    
-                    # Read the parquet file into a pandas DataFrame
-                    df_part = pd.read_parquet(local_path)
-                    all_data.append(df_part)
-                
-                # Combine all the parts
-                if all_data:
-                    df = pd.concat(all_data, ignore_index=True)
-                    
-                    # Limit the number of rows to display
-                    if limit > 0:
-                        df = df.head(limit)
-                    
-                    # Display the data
-                    print("\nRESTAURANT VIOLATIONS ANALYSIS RESULTS:")
-                    print("="*50)
-                    print(tabulate(df, headers='keys', tablefmt='psql', showindex=False))
-                    print("="*50)
-                    print(f"Showing {len(df)} of {sum(len(data) for data in all_data)} rows")
-                    print(f"Total files in output: {len(parquet_files)}")
-                    
-                    return df
-                else:
-                    print("No data could be read from the parquet files.")
-                    return None
+            paths = [f"{bucket}/{key}" for key in parquet_files]
+            if engine == 'fastparquet':
+                df, total_rows = self._read_with_fastparquet(paths, limit, columns)
+            elif engine == 'polars':
+                df, total_rows = self._read_with_polars(paths, limit, columns)
+            else:
+                df, total_rows = self._read_with_pyarrow(paths, limit, columns)
+
+            self._display_results(df, total_rows, len(parquet_files))
+            return df
+
+        except Exception as e:
+            print(f"Error reading parquet results: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return None
+
+    async def read_parquet_results_async(self, output_uri, limit=10, columns=None):
+        """
+        Read and display results from parquet files in S3 using aioboto3
+
+        Lists the output and fetches every part file concurrently on the event
+        loop, which suits outputs made of many small part files. Parsing runs
+        in worker threads so it does not block the loop.
+
+        Parameters:
+        -----------
+        output_uri : str
+            S3 URI where the parquet files are stored (e.g., s3://bucket/path/)
+        limit : int
+            Maximum number of rows to display
+        columns : list of str, optional
+            Columns to read. Reads all columns when None.
+        """
+        if aioboto3 is None:
+            raise ImportError("read_parquet_results_async requires aioboto3 (pip install aioboto3)")
+
+        try:
+            bucket, prefix = self._parse_s3_uri(output_uri)
+
+            session = aioboto3.Session()
+            # Size the connection pool to the number of in-flight GETs; the
+            # default pool of 10 would cap the concurrency below
+            config = AioConfig(max_pool_connections=S3_READ_CONCURRENCY, retries=BOTO_RETRIES)
+            async with session.client('s3', region_name=self.region, config=config) as s3:
+                print(f"Listing objects in {output_uri}...")
+                paginator = s3.get_paginator('list_objects_v2')
+                keys = []
+                async for page in paginator.paginate(**self._list_output_kwargs(bucket, prefix)):
+                    keys.extend(obj['Key'] for obj in page.get('Contents', []))
+
+                parquet_files = self._find_parquet_files(output_uri, keys)
+                if not parquet_files:
+                    return
+
+                semaphore = asyncio.Semaphore(S3_READ_CONCURRENCY)
+
+                async def read_part(key):
+                    async with semaphore:
+                        response = await s3.get_object(Bucket=bucket, Key=key)
+                        async with response['Body'] as stream:
+                            body = await stream.read()
+                    return await asyncio.to_thread(
+                        pq.read_table, pa.BufferReader(body), columns=columns
+                    )
+
+                tables = await asyncio.gather(*[read_part(key) for key in parquet_files])
+
+            table = pa.concat_tables(tables)
+            total_rows = table.num_rows
+
+            # Limit the number of rows to display
+            if limit > 0:
+                table = table.slice(0, limit)
+            df = table.to_pandas(split_blocks=True, self_destruct=True)
+
+            self._display_results(df, total_rows, len(parquet_files))
+            return df
 
         except Exception as e:
             print(f"Error reading parquet results: {str(e)}")
@@ -185,8 +503,26 @@ if __name__ == "__main__":
     parser.add_argument('--wait', action='store_true', help='Wait for job completion')
     parser.add_argument('--show-results', action='store_true', help='Show results after job completion')
     parser.add_argument('--limit', type=int, default=10, help='Maximum number of result rows to display')
+    parser.add_argument('--engine', choices=READ_ENGINES, default='pyarrow', help='Parquet reader used to show results')
+    parser.add_argument('--async-read', action='store_true', help='Fetch result files concurrently with aioboto3 (pyarrow engine only)')
     
     args = parser.parse_args()
+
+    if args.async_read and args.engine != 'pyarrow':
+        parser.error("--async-read always parses with pyarrow and cannot be combined with --engine")
+
+    # Report missing optional readers now rather than after the EMR step has run
+    if args.show_results and args.engine == 'fastparquet' and fastparquet is None:
+        parser.error("--engine fastparquet requires fastparquet (pip install fastparquet)")
+    if args.show_results and args.engine == 'polars' and pl is None:
+        parser.error("--engine polars requires polars (pip install polars)")
+    if args.show_results and args.async_read and aioboto3 is None:
+        parser.error("--async-read requires aioboto3 (pip install aioboto3)")
+
+    # pyarrow's IO pool (8 threads by default) bounds the concurrent S3 GETs;
+    # size it once for the CLI process rather than on every read
+    if args.wait and args.show_results:
+        pa.set_io_thread_count(max(S3_READ_CONCURRENCY, os.cpu_count() or 1))
     
     client = EMRClient(region=args.region)
     
@@ -210,7 +546,16 @@ if __name__ == "__main__":
         
         # Show results if requested
         if args.show_results:
-            client.read_parquet_results(
-                args.output, 
-                limit=args.limit
-            )
\ No newline at end of file
+            if args.async_read:
+                asyncio.run(client.read_parquet_results_async(
+                    args.output,
+                    limit=args.limit,
+                    columns=RESULT_COLUMNS
+                ))
+            else:
+                client.read_parquet_results(
+                    args.output, 
+                    limit=args.limit,
+                    columns=RESULT_COLUMNS,
+                    engine=args.engine
+                )
\ No newline at end of file
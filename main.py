@@ -1,10 +1,20 @@
 import argparse
 
 from pyspark.sql import SparkSession
-from pyspark.sql.functions import col
+from pyspark.sql.functions import col, count, lit
 
 def transform_data(data_source: str, output_uri: str) -> None:
-    with SparkSession.builder.appName("Transform Data").getOrCreate() as spark:
+    # enable adaptive query execution so the small GROUP BY result isn't
+    # spread over hundreds of near-empty shuffle partitions
+    builder = (
+        SparkSession.builder.appName("Transform Data")
+        .config("spark.sql.adaptive.enabled", "true")
+        .config("spark.sql.adaptive.coalescePartitions.enabled", "true")
+        .config("spark.sql.adaptive.skewJoin.enabled", "true")
+        .config("spark.sql.shuffle.partitions", "64")
+    )
+
+    with builder.getOrCreate() as spark:
         
         # load csv file
         df = spark.read.option("header", "true").csv(data_source)
@@ -15,25 +25,28 @@ def transform_data(data_source: str, output_uri: str) -> None:
             col("Violation Type").alias("violation_type"),
         )
 
-        # create an in-memory table
-        df.createOrReplaceTempView("restaurant_violations")
+        # count RED violations per restaurant
+        transformed_df = (
+            df.filter(col("violation_type") == "RED")
+            .groupBy("name")
+            .agg(count(lit(1)).alias("total_red_violations"))
+        )
 
-        # construc the query
-        GROUP_BY_QUERY = """
-            SELECT name, count(*) AS total_red_violations
-            FROM restaurant_violations
-            WHERE violation_type = 'RED'
-            GROUP BY name;
-        """
-        
-        # transform data
-        transformed_df = spark.sql(GROUP_BY_QUERY)
+        # cache the aggregate so counting it after the write doesn't rerun the query
+        transformed_df.cache()
+
+        # write our results as a single zstd-compressed parquet file; the
+        # aggregate is small, and one part file is much cheaper for the client
+        # to fetch
+        (
+            transformed_df.coalesce(1)
+            .write.option("compression", "zstd")
+            .mode("overwrite")
+            .parquet(output_uri)
+        )
 
         # log in to EMR stdout
-        print("Number of rows in sql query: ", transformed_df.count())
-
-        # write our results as parquet file
-        transformed_df.write.mode("overwrite").parquet(output_uri)
+        print("Number of rows in result: ", transformed_df.count())
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()